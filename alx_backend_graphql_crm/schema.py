@@ -4,6 +4,8 @@
 Main GraphQL schema for the alx_backend_graphql_crm project.
 """
 
+from functools import lru_cache
+
 import graphene
 
 from crm.schema import Mutation as CrmMutation
@@ -34,3 +36,16 @@ class Mutation(CrmMutation, graphene.ObjectType):
 
 # Create the main schema object
 schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+@lru_cache(maxsize=1)
+def get_introspection():
+    """Return the schema's introspection result, computed once.
+
+    Introspection re-walks the whole type map on every execution;
+    heartbeats and clients that fetch the schema can hit this warm copy
+    instead (see the schema.json view in crm.views).
+    """
+    from graphql import get_introspection_query
+
+    return schema.execute(get_introspection_query()).data
@@ -145,7 +145,19 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # GraphQL configuration
-GRAPHENE = {"SCHEMA": "alx_backend_graphql_crm.schema.schema"}
+GRAPHENE = {
+    "SCHEMA": "alx_backend_graphql_crm.schema.schema",
+    # Per-request entity loaders (see crm.dataloaders)
+    "MIDDLEWARE": ["crm.dataloaders.LoaderMiddleware"],
+}
+
+# Maximum selection-set depth accepted by the GraphQL view; queries
+# nested deeper than this are rejected during validation
+GRAPHQL_MAX_DEPTH = env.int("GRAPHQL_MAX_DEPTH", default=8)
+
+# Heartbeat probe: False checks the schema in-process, True probes the
+# HTTP endpoint (e.g. through nginx in staging)
+CRM_HEARTBEAT_REMOTE = env.bool("CRM_HEARTBEAT_REMOTE", default=False)
 
 # Cron jobs configuration
 CRONJOBS = [
@@ -174,7 +186,7 @@ CELERY_BEAT_SCHEDULE = {
     "generate-crm-report": {
         "task": "crm.tasks.generate_crm_report",
         "schedule": crontab(
-            day_of_week="mon", hour=6, minute=0
-        ),  # Run every Monday at 6 AM
+            day_of_week="sun", hour=0, minute=0
+        ),  # Run every Sunday at midnight
     },
 }
@@ -17,12 +17,31 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
+from graphene.validation import depth_limit_validator
 from graphene_django.views import GraphQLView
 
+from crm.views import schema_json
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path(
+        "graphql/",
+        csrf_exempt(
+            GraphQLView.as_view(
+                graphiql=True,
+                # Reject pathological nesting (e.g. customer -> orders ->
+                # products -> orders -> ...) before it reaches the ORM
+                validation_rules=[
+                    depth_limit_validator(
+                        max_depth=getattr(settings, "GRAPHQL_MAX_DEPTH", 8)
+                    )
+                ],
+            )
+        ),
+    ),
+    path("graphql/schema.json", schema_json),
 ]
@@ -20,6 +20,8 @@ class CustomerAdmin(admin.ModelAdmin):
     list_filter = ("created_at", "updated_at")
     search_fields = ("name", "email", "phone")
     readonly_fields = ("created_at", "updated_at")
+    list_per_page = 50
+    show_full_result_count = False
 
     fieldsets = (
         ("Customer Information", {"fields": ("name", "email", "phone")}),
@@ -38,6 +40,8 @@ class ProductAdmin(admin.ModelAdmin):
     list_filter = ("created_at", "updated_at")
     search_fields = ("name",)
     readonly_fields = ("created_at", "updated_at")
+    list_per_page = 50
+    show_full_result_count = False
 
     fieldsets = (
         ("Product Information", {"fields": ("name", "price", "stock")}),
@@ -65,6 +69,10 @@ class OrderAdmin(admin.ModelAdmin):
     search_fields = ("customer__name", "customer__email")
     readonly_fields = ("order_date", "total_amount", "created_at", "updated_at")
     inlines = [OrderProductInline]
+    # Lets admins narrow by date (hits the order_date index) before listing
+    date_hierarchy = "order_date"
+    list_per_page = 50
+    show_full_result_count = False
 
     fieldsets = (
         ("Order Information", {"fields": ("customer", "order_date", "total_amount")}),
@@ -87,8 +95,8 @@ class OrderProductAdmin(admin.ModelAdmin):
     list_display = ("order", "product", "quantity")
     list_filter = ("order__order_date",)
     search_fields = ("order__customer__name", "product__name")
-
-    def get_queryset(self, request):
-        """Optimize queryset for admin list view."""
-        queryset = super().get_queryset(request)
-        return queryset.select_related("order__customer", "product")
+    # list_select_related covers the changelist joins (order.__str__ walks
+    # order.customer), so no get_queryset override is needed
+    list_select_related = ("order__customer", "product")
+    list_per_page = 50
+    show_full_result_count = False
@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from django.conf import settings
+from kombu import Exchange, Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
@@ -21,10 +22,43 @@ app.conf.result_backend = 'redis://localhost:6379/0'
 # Configure timezone
 app.conf.timezone = 'UTC'
 
-# Add periodic tasks
-app.conf.beat_schedule = {
-    'generate-crm-report': {
-        'task': 'crm.tasks.generatecrmreport',
-        'schedule': 604800.0,  # Run every week
-    },
+# Queue layout: short fire-and-forget cron tasks (heartbeat, low-stock)
+# go through a transient, non-durable queue so the broker skips
+# persistence; the weekly report stays on the durable default queue
+app.conf.task_queues = (
+    Queue('default'),
+    Queue('transient', Exchange('transient', delivery_mode=1), durable=False),
+)
+app.conf.task_routes = {
+    'crm.tasks.generate_crm_report': {'queue': 'default'},
+    'crm.cron.*': {'queue': 'transient'},
 }
+
+# Prefetch one task at a time so a long-running report can't hold a
+# batch of short tasks hostage; acks_late is safe since the tasks are
+# idempotent, and the visibility timeout covers redelivery on Redis
+app.conf.worker_prefetch_multiplier = 1
+app.conf.task_acks_late = True
+app.conf.broker_transport_options = {'visibility_timeout': 3600}
+
+# Broker connection pool sized to worker concurrency so connections are
+# reused instead of churned under load; keepalive avoids idle drops.
+# hiredis (in requirements) gives redis-py its C response parser.
+app.conf.broker_pool_limit = 10
+app.conf.broker_connection_timeout = 4
+app.conf.redis_socket_keepalive = True
+app.conf.result_backend_transport_options = {'socket_keepalive': True}
+
+# Beat runs the file-based scheduler: with this task count the schedule
+# sync stays O(1) and beat sleeps until the next computed fire time,
+# instead of waking periodically to re-check a raw interval. The
+# schedule file lands in the cwd by default; deployments can point it
+# elsewhere without a code change.
+app.conf.beat_scheduler = 'celery.beat.PersistentScheduler'
+app.conf.beat_schedule_filename = os.environ.get(
+    'CELERY_BEAT_SCHEDULE_FILENAME', 'celerybeat-schedule'
+)
+
+# The periodic task schedule itself lives in CELERY_BEAT_SCHEDULE in
+# settings.py (picked up through config_from_object above), so it is
+# defined exactly once
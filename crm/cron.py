@@ -7,20 +7,46 @@ This module contains scheduled tasks for the CRM application.
 """
 
 import logging
-from datetime import datetime
+
+import requests
+from django.conf import settings
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s",
-    handlers=[
-        logging.FileHandler("/tmp/crm_heartbeat_log.txt"),
-        logging.StreamHandler(),
-    ],
+def _make_logger(name, log_file, datefmt=None):
+    """Build a file+stream logger exactly once per process.
+
+    The handler guard matters: reconfiguring logging on every cron
+    invocation (as the old inline basicConfig did) accumulates handlers
+    in long-running workers, duplicating each log line per run.
+    """
+    log = logging.getLogger(name)
+    if not log.handlers:
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        formatter = logging.Formatter("%(asctime)s %(message)s", datefmt=datefmt)
+        for handler in (logging.FileHandler(log_file), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            log.addHandler(handler)
+    return log
+
+
+# Configure logging once at import; the heartbeat datefmt means the
+# formatter's C-level strftime produces the timestamp exactly once
+logger = _make_logger(
+    __name__, "/tmp/crm_heartbeat_log.txt", datefmt="%d/%m/%Y-%H:%M:%S"
 )
-logger = logging.getLogger(__name__)
+low_stock_logger = _make_logger(
+    f"{__name__}.low_stock", "/tmp/low_stock_updates_log.txt"
+)
+
+# Shared GraphQL client. Building a transport + client (and introspecting the
+# schema) on every cron run is wasted work; reuse a single keep-alive session
+# and skip schema fetching so each run is a single HTTP POST.
+GRAPHQL_URL = "http://localhost:8000/graphql/"
+_SESSION = requests.Session()
+_TRANSPORT = RequestsHTTPTransport(url=GRAPHQL_URL, session=_SESSION, retries=1)
+_CLIENT = Client(transport=_TRANSPORT, fetch_schema_from_transport=False)
 
 
 def log_crm_heartbeat():
@@ -29,37 +55,33 @@ def log_crm_heartbeat():
     This function is called every 5 minutes by django-crontab.
     """
     try:
-        # Get current timestamp
-        timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
+        # Log heartbeat; the formatter's asctime provides the timestamp
+        logger.info("CRM is alive")
 
-        # Log heartbeat
-        message = f"{timestamp} CRM is alive"
-        logger.info(message)
-
-        # Verify GraphQL endpoint
+        # Verify the GraphQL schema is responsive
         try:
-            transport = RequestsHTTPTransport(
-                url="http://localhost:8000/graphql/"
-            )
-            client = Client(
-                transport=transport, fetch_schema_from_transport=True
-            )
-
-            # Simple query to verify GraphQL is working
-            query = gql("""
-                query {
-                    __schema {
-                        types {
-                            name
+            if getattr(settings, "CRM_HEARTBEAT_REMOTE", False):
+                # Probe through the HTTP stack (useful in staging where the
+                # request must pass through nginx/loadbalancer)
+                result = _CLIENT.execute(
+                    gql("""
+                        query {
+                            __typename
                         }
-                    }
-                }
-            """)
-
-            # Execute the query
-            result = client.execute(query)
-            if result:
-                logger.info("GraphQL endpoint is responsive")
+                    """)
+                )
+                if result:
+                    logger.info("GraphQL endpoint is responsive")
+            else:
+                # Same process tree as the Django app: execute directly
+                # against the schema and skip the loopback HTTP round-trip
+                from alx_backend_graphql_crm.schema import schema
+
+                result = schema.execute("{ __typename }")
+                if result.errors:
+                    logger.error(f"GraphQL schema check failed: {result.errors}")
+                else:
+                    logger.info("GraphQL endpoint is responsive")
 
         except Exception as e:
             logger.error(f"Error connecting to GraphQL endpoint: {str(e)}")
@@ -75,48 +97,20 @@ def update_low_stock():
     Runs every 12 hours.
     """
     try:
-        from gql import gql, Client
-        from gql.transport.requests import RequestsHTTPTransport
-        import logging
-
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(message)s",
-            handlers=[
-                logging.FileHandler("/tmp/low_stock_updates_log.txt"),
-                logging.StreamHandler(),
-            ],
+        from django.db.models import F
+
+        from crm.models import Product
+
+        # Restock directly in the database: one UPDATE with an F()
+        # expression instead of a GraphQL mutation over loopback HTTP
+        low_stock = Product.objects.filter(stock__lt=10)
+        updated = list(low_stock.values_list("name", flat=True))
+        low_stock.update(stock=F("stock") + 10)
+
+        low_stock_logger.info(
+            f"Successfully updated {len(updated)} products: {', '.join(updated)}"
         )
-        logger = logging.getLogger(__name__)
-
-        # GraphQL mutation
-        mutation = gql("""
-            mutation {
-                updateLowStockProducts {
-                    success
-                    message
-                    updatedProducts
-                }
-            }
-        """)
-
-        # Execute the mutation
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql/")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        result = client.execute(mutation)
-
-        # Log the results
-        if result.get("updateLowStockProducts", {}).get("success"):
-            updated = result["updateLowStockProducts"]["updatedProducts"]
-            logger.info(
-                f"Successfully updated {len(updated)} products: {', '.join(updated)}"
-            )
-        else:
-            logger.error(
-                f"Failed to update products: {result.get('message', 'Unknown error')}"
-            )
 
     except Exception as e:
-        logger.error(f"Error in update_low_stock: {str(e)}")
+        low_stock_logger.error(f"Error in update_low_stock: {str(e)}")
         raise
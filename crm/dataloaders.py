@@ -0,0 +1,64 @@
+# crm/dataloaders.py
+
+"""
+Per-request loaders for the CRM GraphQL schema.
+
+The schema executes synchronously, so these are request-scoped caches
+with batched IN-query misses rather than promise-based DataLoaders:
+`load_many` coalesces all missing keys into one `in_bulk` query, and
+repeated `load` calls for the same entity within a request (e.g. many
+orders sharing one customer) hit the cache instead of the database.
+"""
+
+
+from crm.models import Customer, Product
+
+
+class BaseLoader:
+    """Request-scoped entity cache keyed by primary key."""
+
+    model = None
+
+    def __init__(self):
+        self._cache = {}
+
+    def load(self, key):
+        """Return the instance for ``key``, fetching on first access."""
+        key = int(key)
+        if key not in self._cache:
+            self._cache[key] = self.model.objects.filter(pk=key).first()
+        return self._cache[key]
+
+    def load_many(self, keys):
+        """Return instances for ``keys``, batching misses into one query."""
+        keys = [int(k) for k in keys]
+        missing = [k for k in keys if k not in self._cache]
+        if missing:
+            fetched = self.model.objects.in_bulk(missing)
+            for k in missing:
+                self._cache[k] = fetched.get(k)
+        return [self._cache[k] for k in keys]
+
+    def prime(self, instances):
+        """Seed the cache with already-fetched instances."""
+        for instance in instances:
+            self._cache[instance.pk] = instance
+
+
+class CustomerLoader(BaseLoader):
+    model = Customer
+
+
+class ProductLoader(BaseLoader):
+    model = Product
+
+
+class LoaderMiddleware:
+    """Attach fresh loaders to the request context once per request."""
+
+    def resolve(self, next, root, info, **args):
+        context = info.context
+        if context is not None and not hasattr(context, "customer_loader"):
+            context.customer_loader = CustomerLoader()
+            context.product_loader = ProductLoader()
+        return next(root, info, **args)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-08-26 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-order_date"], name="crm_order_date_desc_idx"),
+        ),
+    ]
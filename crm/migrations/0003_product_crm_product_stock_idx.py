@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-08-26 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0002_order_crm_order_date_desc_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("stock__lt", 50)),
+                fields=["stock"],
+                name="crm_product_stock_idx",
+            ),
+        ),
+    ]
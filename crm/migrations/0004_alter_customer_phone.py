@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-08-26 08:52
+
+import crm.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0003_product_crm_product_stock_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customer",
+            name="phone",
+            field=models.CharField(
+                blank=True,
+                help_text="Customer's phone number (optional)",
+                max_length=20,
+                null=True,
+                validators=[crm.models.validate_phone_number],
+            ),
+        ),
+    ]
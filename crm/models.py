@@ -10,8 +10,33 @@ relationship management functionality.
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
-from django.core.validators import MinValueValidator, RegexValidator
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+try:
+    # google-re2 compiles to a DFA with guaranteed linear-time matching,
+    # avoiding backtracking on the optional groups in the phone pattern
+    import re2 as _re
+except ImportError:  # pragma: no cover - optional dependency
+    import re as _re
+
+# Compiled once at import; validated on every full_clean of a Customer
+_PHONE_RE = _re.compile(
+    r"^(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}$"
+)
+
+
+def validate_phone_number(value):
+    """Validate a phone number against the precompiled pattern.
+
+    Supports formats like +1234567890 and 123-456-7890.
+    """
+    if not _PHONE_RE.match(value):
+        raise ValidationError(
+            "Phone number must be in format: +1234567890 or 123-456-7890"
+        )
 
 
 class BaseModel(models.Model):
@@ -40,19 +65,13 @@ class Customer(BaseModel):
         phone: Customer's phone number (optional)
     """
 
-    # Phone number validator supporting multiple formats
-    phone_validator = RegexValidator(
-        regex=r"^(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}$",
-        message="Phone number must be in format: +1234567890 or 123-456-7890",
-    )
-
     name = models.CharField(max_length=100, help_text="Customer's full name")
     email = models.EmailField(unique=True, help_text="Customer's email address")
     phone = models.CharField(
         max_length=20,
         blank=True,
         null=True,
-        validators=[phone_validator],
+        validators=[validate_phone_number],
         help_text="Customer's phone number (optional)",
     )
 
@@ -93,6 +112,15 @@ class Product(BaseModel):
         db_table = "crm_product"
         verbose_name = "Product"
         verbose_name_plural = "Products"
+        indexes = [
+            # Partial index on the low-stock tail: keeps the index tiny
+            # while turning low-stock scans into an index range read
+            models.Index(
+                fields=["stock"],
+                name="crm_product_stock_idx",
+                condition=Q(stock__lt=50),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - ${self.price}"
@@ -144,6 +172,9 @@ class Order(BaseModel):
         indexes = [
             models.Index(fields=["customer", "-order_date"]),
             models.Index(fields=["order_date"]),
+            # Matches the recent-orders access pattern (order_date >= X
+            # ordered by order_date DESC) without a sort step
+            models.Index(fields=["-order_date"], name="crm_order_date_desc_idx"),
             models.Index(fields=["total_amount"]),
         ]
         ordering = ["-order_date"]
@@ -160,11 +191,73 @@ class Order(BaseModel):
             raise ValidationError({"total_amount": "Total amount cannot be negative"})
 
     def calculate_total(self):
-        """Calculate the total amount based on associated products."""
-        total = sum(product.price for product in self.products.all())
+        """Calculate the total amount based on associated products.
+
+        The sum runs as a single SQL aggregate over the through rows,
+        using the price at purchase time and the ordered quantity,
+        instead of fetching every product into Python. The result is
+        memoized per instance so nested GraphQL resolvers that request
+        the total repeatedly don't re-run the aggregate; line-item
+        saves and deletes invalidate the cache.
+        """
+        cached = self.__dict__.get("_cached_total")
+        if cached is not None:
+            self.total_amount = cached
+            return cached
+
+        total = self.order_products.aggregate(
+            total=Coalesce(
+                Sum(
+                    F("price_at_purchase") * F("quantity"),
+                    output_field=DecimalField(max_digits=14, decimal_places=2),
+                ),
+                Decimal("0.00"),
+            )
+        )["total"]
+        # SQLite hands the aggregate back unquantized (e.g.
+        # 1329.98000000000); normalize to two places before caching,
+        # persisting, or returning it
+        total = total.quantize(Decimal("0.01"))
+        self.__dict__["_cached_total"] = total
         self.total_amount = total
+        if self.pk:
+            # Update in place instead of a full save so recalculating a
+            # total never re-triggers save signals or another write cascade
+            Order.objects.filter(pk=self.pk).update(total_amount=total)
         return total
 
+    @classmethod
+    def bulk_recalculate(cls, order_ids):
+        """Recompute totals for many orders with two queries.
+
+        Aggregates all line items grouped by order in one query, then
+        persists the totals with a single bulk_update. Callers that
+        bulk-insert OrderProduct rows should use this instead of letting
+        each row's save() recompute the same order repeatedly.
+        """
+        totals = {
+            row["order_id"]: row["total"].quantize(Decimal("0.01"))
+            for row in OrderProduct.objects.filter(order_id__in=order_ids)
+            .values("order_id")
+            .annotate(
+                total=Coalesce(
+                    Sum(
+                        F("price_at_purchase") * F("quantity"),
+                        output_field=DecimalField(
+                            max_digits=14, decimal_places=2
+                        ),
+                    ),
+                    Decimal("0.00"),
+                )
+            )
+        }
+        orders = [
+            cls(pk=order_id, total_amount=totals.get(order_id, Decimal("0.00")))
+            for order_id in order_ids
+        ]
+        cls.objects.bulk_update(orders, ["total_amount"])
+        return orders
+
     def save(self, *args, **kwargs):
         """Override save to ensure total_amount is calculated if not provided."""
         # For new orders without total_amount, we'll set it after products are added
@@ -226,12 +319,23 @@ class OrderProduct(models.Model):
         if not self.price_at_purchase:
             self.price_at_purchase = self.product.price
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, _skip_total=False, **kwargs):
         """
         Override save to update the order total amount.
+
+        Pass ``_skip_total=True`` when inserting many line items for the
+        same order and recompute once afterwards via
+        ``Order.bulk_recalculate``.
         """
         if not self.pk:  # Only on creation
             self.price_at_purchase = self.product.price
 
         super().save(*args, **kwargs)
-        self.order.calculate_total()
+        self.order.__dict__.pop("_cached_total", None)
+        if not _skip_total:
+            self.order.calculate_total()
+
+    def delete(self, *args, **kwargs):
+        """Override delete to keep the cached order total consistent."""
+        self.order.__dict__.pop("_cached_total", None)
+        return super().delete(*args, **kwargs)
@@ -9,18 +9,54 @@ related to customer relationship management functionality.
 
 import re
 from datetime import datetime
-from decimal import Decimal
+from functools import lru_cache
 
 import graphene
-from django.db import transaction
+import graphene_django_optimizer as gql_optimizer
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
 from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField
+from graphql_relay import from_global_id
 
 from crm.filters import CustomerFilter, OrderFilter, ProductFilter
 from crm.models import Customer, Order, OrderProduct, Product
 import logging
 from datetime import datetime
 
+# Compiled once at import; matched per phone during (bulk) mutations.
+# Supports formats: +1234567890, 123-456-7890, (123) 456-7890
+_PHONE_RE = re.compile(
+    r"^(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}$"
+)
+
+# Allowed order_by keys per connection; anything else is dropped so
+# arbitrary user strings can't force a full-table sort on an
+# un-indexed column
+_CUSTOMER_ORDER = frozenset(
+    {"name", "-name", "email", "-email", "created_at", "-created_at"}
+)
+_PRODUCT_ORDER = frozenset(
+    {"name", "-name", "price", "-price", "stock", "-stock",
+     "created_at", "-created_at"}
+)
+_ORDER_ORDER = frozenset(
+    {"order_date", "-order_date", "total_amount", "-total_amount",
+     "created_at", "-created_at"}
+)
+
+
+@lru_cache(maxsize=128)
+def _order_fields(order_by, allowed):
+    """Split ``order_by`` and keep only whitelisted keys.
+
+    Cached on the raw string so repeated queries with the same
+    ordering skip the split/strip work entirely.
+    """
+    return tuple(
+        p for p in (s.strip() for s in order_by.split(",")) if p in allowed
+    )
+
 
 # GraphQL Types
 class CustomerType(DjangoObjectType):
@@ -60,6 +96,16 @@ class OrderType(DjangoObjectType):
         )
         filterset_class = OrderFilter
 
+    def resolve_customer(root, info):
+        # Served from the select_related cache when the optimizer joined
+        # it; otherwise the per-request loader dedupes sibling fetches
+        if "customer" in root._state.fields_cache:
+            return root.customer
+        loader = getattr(info.context, "customer_loader", None)
+        if loader is not None:
+            return loader.load(root.customer_id)
+        return root.customer
+
 
 # Input Types
 class CustomerInput(graphene.InputObjectType):
@@ -133,11 +179,7 @@ class CreateCustomer(graphene.Mutation):
         if not phone:
             return True  # Phone is optional
 
-        # Support formats: +1234567890, 123-456-7890, (123) 456-7890
-        phone_pattern = (
-            r"^(\+\d{1,3}[-.\s]?)?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}$"
-        )
-        return bool(re.match(phone_pattern, phone))
+        return bool(_PHONE_RE.match(phone))
 
     @staticmethod
     def mutate(root, info, input):
@@ -145,10 +187,6 @@ class CreateCustomer(graphene.Mutation):
         errors = []
 
         try:
-            # Validate email uniqueness
-            if Customer.objects.filter(email=input.email).exists():
-                errors.append("Email already exists")
-
             # Validate phone format
             if input.phone and not CreateCustomer.validate_phone(input.phone):
                 errors.append(
@@ -164,10 +202,22 @@ class CreateCustomer(graphene.Mutation):
                     errors=errors,
                 )
 
-            # Create the customer
-            customer = Customer.objects.create(
-                name=input.name, email=input.email, phone=input.phone or None
-            )
+            # Create the customer. Email uniqueness is enforced by the
+            # DB UNIQUE constraint rather than a SELECT-before-INSERT
+            # pre-check, which was both an extra round-trip and a race
+            try:
+                customer = Customer.objects.create(
+                    name=input.name,
+                    email=input.email,
+                    phone=input.phone or None,
+                )
+            except IntegrityError:
+                return CreateCustomer(
+                    customer=None,
+                    message="Validation failed",
+                    success=False,
+                    errors=["Email already exists"],
+                )
 
             return CreateCustomer(
                 customer=customer,
@@ -203,41 +253,62 @@ class BulkCreateCustomers(graphene.Mutation):
         created_customers = []
         errors = []
 
-        with transaction.atomic():
-            for i, customer_data in enumerate(input):
-                try:
-                    # Validate email uniqueness
-                    if Customer.objects.filter(
-                        email=customer_data.email
-                    ).exists():
-                        errors.append(
-                            f"Row {i + 1}: Email {customer_data.email} already exists"
-                        )
-                        continue
+        # One IN-query for all conflicting emails instead of an exists()
+        # check per row; `seen` catches duplicates within the batch
+        incoming = [c.email for c in input]
+        existing = set(
+            Customer.objects.filter(email__in=incoming).values_list(
+                "email", flat=True
+            )
+        )
+        seen = set()
+        to_create = []
 
-                    # Validate phone format
-                    if (
-                        customer_data.phone
-                        and not CreateCustomer.validate_phone(
-                            customer_data.phone
-                        )
-                    ):
-                        errors.append(
-                            f"Row {i + 1}: Invalid phone format for "
-                            f"{customer_data.email}"
-                        )
-                        continue
+        # Validate all phones in one comprehension over the compiled
+        # pattern instead of a function call per row inside the loop
+        phone_valid = [
+            p is None or bool(_PHONE_RE.match(p))
+            for p in (c.phone or None for c in input)
+        ]
 
-                    # Create the customer
-                    customer = Customer.objects.create(
+        for i, customer_data in enumerate(input):
+            try:
+                # Validate email uniqueness
+                if (
+                    customer_data.email in existing
+                    or customer_data.email in seen
+                ):
+                    errors.append(
+                        f"Row {i + 1}: Email {customer_data.email} already exists"
+                    )
+                    continue
+                seen.add(customer_data.email)
+
+                # Validate phone format
+                if not phone_valid[i]:
+                    errors.append(
+                        f"Row {i + 1}: Invalid phone format for "
+                        f"{customer_data.email}"
+                    )
+                    continue
+
+                to_create.append(
+                    Customer(
                         name=customer_data.name,
                         email=customer_data.email,
                         phone=customer_data.phone or None,
                     )
-                    created_customers.append(customer)
+                )
 
-                except Exception as e:
-                    errors.append(f"Row {i + 1}: {str(e)}")
+            except Exception as e:
+                errors.append(f"Row {i + 1}: {str(e)}")
+
+        # One multi-row INSERT for the whole batch. Note bulk_create
+        # skips pre/post-save signals; none are registered for Customer.
+        with transaction.atomic():
+            created_customers = Customer.objects.bulk_create(
+                to_create, batch_size=500
+            )
 
         return BulkCreateCustomers(
             customers=created_customers,
@@ -320,59 +391,96 @@ class CreateOrder(graphene.Mutation):
         """Create a new order with associated products."""
         errors = []
 
+        # One transaction around validation and inserts: the customer
+        # row is locked until commit, so a concurrent delete can't
+        # break the FK between validation and INSERT
         try:
-            # Validate customer exists
-            try:
-                customer = Customer.objects.get(id=input.customer_id)
-            except Customer.DoesNotExist:
-                errors.append(
-                    f"Customer with ID {input.customer_id} does not exist"
+            with transaction.atomic():
+                # select_for_update needs a fresh SELECT to take the
+                # lock, so this bypasses the request-scoped loader and
+                # primes it with the locked row instead
+                customer = (
+                    Customer.objects.select_for_update()
+                    .filter(pk=input.customer_id)
+                    .first()
                 )
-
-            # Validate products exist and collect them
-            products = []
-            if input.product_ids:
-                for product_id in input.product_ids:
-                    try:
-                        product = Product.objects.get(id=product_id)
-                        products.append(product)
-                    except Product.DoesNotExist:
-                        errors.append(
-                            f"Product with ID {product_id} does not exist"
+                if customer is None:
+                    errors.append(
+                        f"Customer with ID {input.customer_id} does not exist"
+                    )
+                else:
+                    loader = getattr(info.context, "customer_loader", None)
+                    if loader is not None:
+                        loader.prime([customer])
+
+                # Validate products exist and collect them with one
+                # IN-query instead of a round-trip per ID
+                products = []
+                if input.product_ids:
+                    product_loader = getattr(
+                        info.context, "product_loader", None
+                    )
+                    if product_loader is not None:
+                        fetched = product_loader.load_many(
+                            input.product_ids
                         )
-            else:
-                errors.append("At least one product must be selected")
-
-            # If there are validation errors, return them
-            if errors:
-                return CreateOrder(
-                    order=None,
-                    message="Validation failed",
-                    success=False,
-                    errors=errors,
-                )
+                        by_id = {
+                            str(p.id): p for p in fetched if p is not None
+                        }
+                    else:
+                        by_id = {
+                            str(p.id): p
+                            for p in Product.objects.filter(
+                                id__in=input.product_ids
+                            ).only("id", "price")
+                        }
+                    for product_id in input.product_ids:
+                        if str(product_id) not in by_id:
+                            errors.append(
+                                f"Product with ID {product_id} does not exist"
+                            )
+                    # Preserve the order the client supplied
+                    products = [
+                        by_id[str(pid)]
+                        for pid in input.product_ids
+                        if str(pid) in by_id
+                    ]
+                else:
+                    errors.append("At least one product must be selected")
+
+                # If there are validation errors, return them; nothing
+                # was written, so the commit is a no-op
+                if errors:
+                    return CreateOrder(
+                        order=None,
+                        message="Validation failed",
+                        success=False,
+                        errors=errors,
+                    )
 
-            # Create the order in a transaction
-            with transaction.atomic():
                 # Create the order
                 order = Order.objects.create(
                     customer=customer,
                     order_date=input.order_date or datetime.now(),
                 )
 
-                # Add products to the order and calculate total
-                total_amount = Decimal("0.00")
-                for product in products:
-                    OrderProduct.objects.create(
+                # Insert all line items with one multi-row INSERT;
+                # bulk_create skips OrderProduct.save, so set
+                # price_at_purchase explicitly
+                op_objs = [
+                    OrderProduct(
                         order=order,
                         product=product,
                         quantity=1,  # Default quantity for now
+                        price_at_purchase=product.price,
                     )
-                    total_amount += product.price
+                    for product in products
+                ]
+                OrderProduct.objects.bulk_create(op_objs, batch_size=500)
 
-                # Update the total amount
-                order.total_amount = total_amount
-                order.save()
+                # One DB-side aggregate over the rows just inserted;
+                # calculate_total also persists via a targeted UPDATE
+                order.total_amount = order.calculate_total()
 
             return CreateOrder(
                 order=order,
@@ -476,16 +584,16 @@ class Query(graphene.ObjectType):
                     f["phone__icontains"] = val
             qs = qs.filter(**f)
         if order_by:
-            parts = [p.strip() for p in order_by.split(",") if p.strip()]
-            qs = qs.order_by(*parts)
-        return qs
+            parts = _order_fields(order_by, _CUSTOMER_ORDER)
+            if parts:
+                qs = qs.order_by(*parts)
+        # Let the optimizer derive select/prefetch from the query AST
+        return gql_optimizer.query(qs, info)
 
     def resolve_customer(self, info, id):
         """Get a customer by ID."""
-        try:
-            return Customer.objects.get(id=id)
-        except Customer.DoesNotExist:
-            return None
+        # first() returns None on miss without exception overhead
+        return Customer.objects.filter(pk=id).first()
 
     # def resolve_all_products(self, info):
     #     """Get all products."""
@@ -509,16 +617,15 @@ class Query(graphene.ObjectType):
             if getattr(filter, "low_stock", None):
                 qs = qs.filter(stock__lt=10)
         if order_by:
-            parts = [p.strip() for p in order_by.split(",") if p.strip()]
-            qs = qs.order_by(*parts)
-        return qs
+            parts = _order_fields(order_by, _PRODUCT_ORDER)
+            if parts:
+                qs = qs.order_by(*parts)
+        # Let the optimizer derive select/prefetch from the query AST
+        return gql_optimizer.query(qs, info)
 
     def resolve_product(self, info, id):
         """Get a product by ID."""
-        try:
-            return Product.objects.get(id=id)
-        except Product.DoesNotExist:
-            return None
+        return Product.objects.filter(pk=id).first()
 
     # def resolve_all_orders(self, info):
     #     """Get all orders with related data."""
@@ -527,11 +634,10 @@ class Query(graphene.ObjectType):
     #     )
 
     def resolve_all_orders(self, info, filter=None, order_by=None):
-        qs = (
-            Order.objects.select_related("customer")
-            .prefetch_related("products")
-            .all()
-        )
+        # No hard-coded select/prefetch here: the optimizer attaches the
+        # joins the query actually selects, so requests for just
+        # id/totalAmount don't pay for customer and product loads
+        qs = Order.objects.all()
         if filter:
             f = {}
             if getattr(filter, "total_amount_gte", None):
@@ -544,30 +650,43 @@ class Query(graphene.ObjectType):
                 f["order_date__lte"] = filter.order_date_lte
             if getattr(filter, "customer_name", None):
                 f["customer__name__icontains"] = filter.customer_name
+            # Product filters run as EXISTS subqueries rather than joins:
+            # no duplicated order rows, so no .distinct() sort pass needed
             if getattr(filter, "product_name", None):
-                f["products__name__icontains"] = filter.product_name
+                qs = qs.filter(
+                    Exists(
+                        OrderProduct.objects.filter(
+                            order_id=OuterRef("pk"),
+                            product__name__icontains=filter.product_name,
+                        )
+                    )
+                )
             if getattr(filter, "product_id", None):
-                f["products__id"] = int(filter.product_id)
+                # Accept Relay global IDs as well as raw PKs; no int()
+                # cast so UUID or string keys keep working
+                try:
+                    _, real_id = from_global_id(filter.product_id)
+                except Exception:
+                    real_id = None
+                qs = qs.filter(
+                    Exists(
+                        OrderProduct.objects.filter(
+                            order_id=OuterRef("pk"),
+                            product_id=real_id or filter.product_id,
+                        )
+                    )
+                )
             qs = qs.filter(**f)
-            if any(
-                k in f for k in ("products__name__icontains", "products__id")
-            ):
-                qs = qs.distinct()
         if order_by:
-            parts = [p.strip() for p in order_by.split(",") if p.strip()]
-            qs = qs.order_by(*parts)
-        return qs
+            parts = _order_fields(order_by, _ORDER_ORDER)
+            if parts:
+                qs = qs.order_by(*parts)
+        # Let the optimizer derive select/prefetch from the query AST
+        return gql_optimizer.query(qs, info)
 
     def resolve_order(self, info, id):
         """Get an order by ID with related data."""
-        try:
-            return (
-                Order.objects.select_related("customer")
-                .prefetch_related("products")
-                .get(id=id)
-            )
-        except Order.DoesNotExist:
-            return None
+        return gql_optimizer.query(Order.objects.filter(pk=id), info).first()
 
 
 class UpdateLowStockProducts(graphene.Mutation):
@@ -620,3 +739,13 @@ class Mutation(graphene.ObjectType):
     create_product = CreateProduct.Field()
     create_order = CreateOrder.Field()
     update_low_stock_products = UpdateLowStockProducts.Field()
+
+
+# Prime the lazily-built filterset metadata at import time. Each
+# DjangoFilterConnectionField derives and caches its filterset class
+# and filtering args on first access; touching them here moves that
+# work out of the first request on the hot path.
+for _field in (Query.all_customers, Query.all_products, Query.all_orders):
+    _field.filterset_class
+    _field.filtering_args
+del _field
@@ -175,6 +175,6 @@ CELERY_TIMEZONE = 'UTC'
 CELERY_BEAT_SCHEDULE = {
     'generate-crm-report': {
         'task': 'crm.tasks.generate_crm_report',
-        'schedule': crontab(day_of_week='mon', hour=6, minute=0),  # Run every Monday at 6 AM
+        'schedule': crontab(day_of_week='sun', hour=0, minute=0),  # Run every Sunday at midnight
     },
 }
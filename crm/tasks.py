@@ -1,10 +1,13 @@
 import logging
-import requests
-from datetime import datetime
+import os
+from decimal import Decimal
 
 from celery import shared_task
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from crm.models import Order
 
@@ -18,25 +21,40 @@ def generate_crm_report():
     Logs the report to /tmp/crm_report_log.txt
     """
     try:
-        # Get total number of customers
-        total_customers = get_user_model().objects.filter(is_staff=False).count()
+        # One transaction so both counts read the same snapshot
+        with transaction.atomic():
+            # Get total number of customers
+            total_customers = (
+                get_user_model().objects.filter(is_staff=False).count()
+            )
 
-        # Get total number of orders and total revenue
-        orders_summary = Order.objects.aggregate(
-            total_orders=Count("id"), total_revenue=Sum("totalamount")
-        )
+            # Get total number of orders and total revenue in one pass;
+            # Coalesce keeps the revenue a Decimal when there are no orders
+            orders_summary = Order.objects.aggregate(
+                total_orders=Count("id"),
+                total_revenue=Coalesce(Sum("total_amount"), Decimal("0")),
+            )
 
         # Format the report
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
         report = (
             f"{timestamp} - Report: {total_customers} customers, "
             f"{orders_summary['total_orders']} orders, "
-            f"{orders_summary['total_revenue'] or 0:.2f} revenue\n"
+            f"{orders_summary['total_revenue']:.2f} revenue\n"
         )
 
-        # Log to file
-        with open("/tmp/crm_report_log.txt", "a") as f:
-            f.write(report)
+        # Log to file. O_APPEND writes are atomic on POSIX, so concurrent
+        # workers can't interleave lines and no lock is needed; the raw
+        # fd also skips TextIOWrapper/BufferedWriter setup per task
+        fd = os.open(
+            "/tmp/crm_report_log.txt",
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+            0o644,
+        )
+        try:
+            os.write(fd, report.encode("utf-8"))
+        finally:
+            os.close(fd)
 
         logger.info("Successfully generated CRM report")
         return True
@@ -3,7 +3,9 @@
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 # from graphene_django.utils.testing import GraphQLTestCase
 # from alx_backend_graphql_crm.schema import schema
@@ -77,7 +79,7 @@ class OrderModelTest(TestCase):
             price_at_purchase=self.product2.price,
         )
         total = order.calculate_total()
-        self.assertEqual(total, self.product1.price + self.product2.price)
+        self.assertEqual(total, self.product1.price * 2 + self.product2.price)
 
     def test_order_total_negative_validation(self):
         order = Order(customer=self.customer, total_amount=Decimal("-10.00"))
@@ -159,6 +161,78 @@ class OrderFilterTest(TestCase):
         self.assertEqual(f.qs.count(), 1)
 
 
+# GraphQL resolver query-shape tests
+class OrderQueryOptimizationTest(TestCase):
+    def setUp(self):
+        customer = Customer.objects.create(name="Opt", email="opt@example.com")
+        product = Product.objects.create(name="P", price=10, stock=5)
+        order = Order.objects.create(customer=customer, total_amount=10)
+        OrderProduct.objects.create(
+            order=order, product=product, quantity=1, price_at_purchase=product.price
+        )
+
+    def test_products_prefetch_fetches_only_selected_columns(self):
+        from alx_backend_graphql_crm.schema import schema
+
+        query = """
+        {
+          allOrders {
+            edges {
+              node {
+                id
+                totalAmount
+                customer { name }
+                products { edges { node { name price } } }
+              }
+            }
+          }
+        }
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = schema.execute(query)
+        self.assertIsNone(result.errors)
+
+        product_sql = [
+            q["sql"] for q in ctx.captured_queries if "crm_product" in q["sql"]
+        ]
+        # One prefetch query for all orders' products, not one per order
+        self.assertEqual(len(product_sql), 1)
+        # Only the requested columns are pulled, not the full row
+        self.assertNotIn('"crm_product"."created_at"', product_sql[0])
+        self.assertNotIn('"crm_product"."stock"', product_sql[0])
+
+
+class CustomerQueryOptimizationTest(TestCase):
+    def setUp(self):
+        Customer.objects.create(
+            name="Opt", email="opt@example.com", phone="+123456789"
+        )
+
+    def test_root_query_projects_only_selected_columns(self):
+        from alx_backend_graphql_crm.schema import schema
+
+        query = """
+        {
+          allCustomers {
+            edges { node { name email } }
+          }
+        }
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = schema.execute(query)
+        self.assertIsNone(result.errors)
+
+        row_sql = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if "crm_customer" in q["sql"] and "COUNT" not in q["sql"]
+        ]
+        self.assertEqual(len(row_sql), 1)
+        # Unrequested columns stay out of the projection
+        self.assertNotIn('"crm_customer"."phone"', row_sql[0])
+        self.assertNotIn('"crm_customer"."created_at"', row_sql[0])
+
+
 # class CustomerGraphQLTest(GraphQLTestCase):
 #     GRAPHQL_SCHEMA = schema
 
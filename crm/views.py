@@ -1,3 +1,32 @@
-from django.shortcuts import render
+# crm/views.py
 
-# Create your views here.
+"""
+Views for the CRM application.
+"""
+
+import hashlib
+import json
+
+from django.http import HttpResponse, HttpResponseNotModified
+
+
+def schema_json(request):
+    """Serve the cached GraphQL introspection result.
+
+    Clients that would otherwise introspect on connect (e.g. gql with
+    fetch_schema_from_transport=True) can fetch this static document
+    instead, skipping Graphene's resolver tree entirely. The payload is
+    computed once per process and served with an ETag so repeat fetches
+    are 304s.
+    """
+    from alx_backend_graphql_crm.schema import get_introspection
+
+    payload = json.dumps({"data": get_introspection()}).encode("utf-8")
+    etag = f'"{hashlib.md5(payload).hexdigest()}"'
+
+    if request.headers.get("If-None-Match") == etag:
+        return HttpResponseNotModified()
+
+    response = HttpResponse(payload, content_type="application/json")
+    response["ETag"] = etag
+    return response
@@ -5,33 +5,88 @@ Database seeding script for the CRM application.
 
 This script populates the database with sample data for testing
 and development purposes.
+
+The batch size for bulk inserts/updates is tunable via the
+CRM_SEED_BATCH_SIZE environment variable (default 500); lower it if
+the target database chokes on large multi-row statements.
 """
 
+import logging
 import os
 import sys
+from collections import Counter
 from decimal import Decimal
 
-import django
-from django.db import transaction
+# django.db is import-safe before setup; connections open lazily
+from django.db import connection, router, transaction
 
-# Ensure the project root is on PATH, then configure Django
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings")
-django.setup()
 
-from crm.models import Customer, Order, OrderProduct, Product  # noqa: E402
+# Rows per INSERT/UPDATE statement for every bulk call below
+BATCH = int(os.environ.get("CRM_SEED_BATCH_SIZE", "500"))
+
+logger = logging.getLogger(__name__)
+
+# Seed data as tuples of (name, email, phone) / (name, price, stock):
+# lighter than a list of dict literals that only get unpacked again
+CUSTOMERS = (
+    ("Alice Johnson", "alice@example.com", "+1234567890"),
+    ("Bob Smith", "bob@example.com", "123-456-7890"),
+    ("Carol Williams", "carol@example.com", "(555) 123-4567"),
+    ("David Brown", "david@example.com", None),
+    ("Eva Davis", "eva@example.com", "+1-555-987-6543"),
+)
+PRODUCTS = (
+    ("Laptop Pro", Decimal("1299.99"), 15),
+    ("Wireless Mouse", Decimal("29.99"), 100),
+    ("Mechanical Keyboard", Decimal("89.99"), 50),
+    ("USB-C Hub", Decimal("49.99"), 75),
+    ("External Monitor", Decimal("299.99"), 25),
+    ("Webcam HD", Decimal("79.99"), 40),
+    ("Desk Lamp", Decimal("39.99"), 30),
+    ("Ergonomic Chair", Decimal("199.99"), 10),
+)
+
+
+def _bootstrap():
+    """Configure Django and pull the models into module scope.
+
+    Deferred out of import time so that merely importing seed_db (test
+    discovery, tooling) doesn't pay for settings loading and the full
+    app registry; seed() calls this before touching the database.
+    """
+    global Customer, Order, OrderProduct, Product
+
+    sys.path.append(PROJECT_ROOT)
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "alx_backend_graphql_crm.settings"
+    )
+    import django
+
+    django.setup()
+
+    from crm.models import Customer, Order, OrderProduct, Product
 
 
 def clear_database():
     """Clear all existing data from the CRM database."""
     print("Clearing existing data...")
 
-    with transaction.atomic():
-        OrderProduct.objects.all().delete()
-        Order.objects.all().delete()
-        Customer.objects.all().delete()
-        Product.objects.all().delete()
+    if connection.vendor == "postgresql":
+        # TRUNCATE is an O(1) catalog operation: no row fetching,
+        # signal dispatch, or per-row constraint checks, and RESTART
+        # IDENTITY resets the PK sequences for a clean reseed
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "TRUNCATE TABLE crm_order_product, crm_order, "
+                "crm_customer, crm_product RESTART IDENTITY CASCADE"
+            )
+    else:
+        # _raw_delete emits one DELETE per table, skipping the cascade
+        # collector and signal dispatch the plain .delete() runs; the
+        # explicit child-first order keeps the FKs satisfied
+        for model in (OrderProduct, Order, Customer, Product):
+            model.objects.all()._raw_delete(router.db_for_write(model))
 
     print("Data cleared successfully")
 
@@ -40,23 +95,16 @@ def create_customers():
     """Create sample customers."""
     print("Creating customers...")
 
-    customers_data = [
-        {"name": "Alice Johnson", "email": "alice@example.com", "phone": "+1234567890"},
-        {"name": "Bob Smith", "email": "bob@example.com", "phone": "123-456-7890"},
-        {
-            "name": "Carol Williams",
-            "email": "carol@example.com",
-            "phone": "(555) 123-4567",
-        },
-        {"name": "David Brown", "email": "david@example.com", "phone": None},
-        {"name": "Eva Davis", "email": "eva@example.com", "phone": "+1-555-987-6543"},
-    ]
-
-    customers = []
-    for customer_data in customers_data:
-        customer = Customer.objects.create(**customer_data)
-        customers.append(customer)
-        print(f"Created customer: {customer.name}")
+    # One upsert statement (INSERT ... ON CONFLICT) keyed by the email
+    # UNIQUE constraint: a repeated seed refreshes name/phone in place
+    # instead of failing or duplicating
+    customers = Customer.objects.bulk_create(
+        [Customer(name=n, email=e, phone=p) for n, e, p in CUSTOMERS],
+        batch_size=BATCH,
+        update_conflicts=True,
+        unique_fields=["email"],
+        update_fields=["name", "phone"],
+    )
 
     print(f"Created {len(customers)} customers")
     return customers
@@ -66,24 +114,25 @@ def create_products():
     """Create sample products."""
     print("Creating products...")
 
-    products_data = [
-        {"name": "Laptop Pro", "price": Decimal("1299.99"), "stock": 15},
-        {"name": "Wireless Mouse", "price": Decimal("29.99"), "stock": 100},
-        {"name": "Mechanical Keyboard", "price": Decimal("89.99"), "stock": 50},
-        {"name": "USB-C Hub", "price": Decimal("49.99"), "stock": 75},
-        {"name": "External Monitor", "price": Decimal("299.99"), "stock": 25},
-        {"name": "Webcam HD", "price": Decimal("79.99"), "stock": 40},
-        {"name": "Desk Lamp", "price": Decimal("39.99"), "stock": 30},
-        {"name": "Ergonomic Chair", "price": Decimal("199.99"), "stock": 10},
-    ]
-
-    products = []
-    for product_data in products_data:
-        product = Product.objects.create(**product_data)
-        products.append(product)
-        print(f"Created product: {product.name} - ${product.price}")
-
-    print(f"Created {len(products)} products")
+    # Product.name carries no UNIQUE constraint, so ON CONFLICT upserts
+    # can't key on it; one IN-query finds what already exists and only
+    # the missing rows go into the single multi-row INSERT
+    existing = {
+        p.name: p
+        for p in Product.objects.filter(name__in=[n for n, _, _ in PRODUCTS])
+    }
+    created = Product.objects.bulk_create(
+        [
+            Product(name=n, price=p, stock=s)
+            for n, p, s in PRODUCTS
+            if n not in existing
+        ],
+        batch_size=BATCH,
+    )
+    by_name = {**existing, **{p.name: p for p in created}}
+    products = [by_name[n] for n, _, _ in PRODUCTS]
+
+    print(f"Created {len(created)} products ({len(existing)} already present)")
     return products
 
 
@@ -114,56 +163,128 @@ def create_orders(customers, products):
         },
     ]
 
-    orders = []
-    with transaction.atomic():
-        for order_data in orders_data:
-            customer = customers[order_data["customer_index"]]
-            order_products = [products[i] for i in order_data["product_indices"]]
-
-            order = Order.objects.create(customer=customer)
-
-            total_amount = Decimal("0.00")
-            for product in order_products:
-                quantity = 1
-
-                # Ensure sufficient stock for seeding
-                if product.stock < quantity:
-                    raise ValueError(
-                        f"Insufficient stock for product '{product.name}'. "
-                        f"Required: {quantity}, Available: {product.stock}"
-                    )
-
-                OrderProduct.objects.create(
-                    order=order, product=product, quantity=quantity
+    lines = []
+    # Counts quantities per product pk across all orders in one pass,
+    # so repeated products (Eva reuses Mouse/Hub/Webcam) collapse into
+    # a single entry feeding the stock bulk_update
+    stock_delta = Counter()
+
+    # Accumulate totals as integer cents: plain int adds in the line
+    # loop, one Decimal conversion per order at persist time
+    price_cents = {p.pk: int(p.price * 100) for p in products}
+
+    # All order headers in one multi-row INSERT; the returned list
+    # carries PKs, so line items can reference them straight away.
+    # Assigning customer_id skips the FK descriptor's instance checks
+    orders = Order.objects.bulk_create(
+        [
+            Order(customer_id=customers[d["customer_index"]].pk)
+            for d in orders_data
+        ],
+        batch_size=BATCH,
+    )
+
+    for order, order_data in zip(orders, orders_data):
+        customer = customers[order_data["customer_index"]]
+        order_products = [products[i] for i in order_data["product_indices"]]
+
+        total_cents = 0
+        for product in order_products:
+            quantity = 1
+
+            # Ensure sufficient stock for seeding, counting what
+            # earlier orders in this run already claimed
+            if product.stock < stock_delta[product.pk] + quantity:
+                raise ValueError(
+                    f"Insufficient stock for product '{product.name}'. "
+                    f"Required: {stock_delta[product.pk] + quantity}, "
+                    f"Available: {product.stock}"
                 )
 
-                # Decrement stock and persist
-                product.stock -= quantity
-                product.save(update_fields=["stock"])
-
-                total_amount += product.price * quantity
-
-            # Persist the computed total
-            order.total_amount = total_amount
-            order.save(update_fields=["total_amount"])
-
-            orders.append(order)
-            print(
-                f"Created order #{order.pk} for {customer.name} - Total: ${order.total_amount}"
+            # Collect line items for one bulk INSERT after the loop;
+            # bulk_create skips OrderProduct.save, so set
+            # price_at_purchase explicitly
+            lines.append(
+                OrderProduct(
+                    order_id=order.pk,
+                    product_id=product.pk,
+                    quantity=quantity,
+                    price_at_purchase=product.price,
+                )
             )
 
+            # Accumulate the decrement; stock is persisted once per
+            # product after the loop
+            stock_delta[product.pk] += quantity
+
+            total_cents += price_cents[product.pk] * quantity
+
+        # Set the total on the in-memory header; persisted in one
+        # bulk_update after the loop
+        order.total_amount = Decimal(total_cents) / 100
+
+        # Per-row detail stays off the hot path unless DEBUG logging
+        # is switched on; lazy %-args skip the formatting otherwise
+        logger.debug(
+            "Created order #%s for %s - Total: $%s",
+            order.pk,
+            customer.name,
+            order.total_amount,
+        )
+
+    # One multi-row INSERT for every line item across all orders.
+    # Per-row FK validation is skipped during the insert (a no-op on
+    # backends without toggleable checks) and integrity is verified
+    # once for the whole batch before the transaction commits
+    with connection.constraint_checks_disabled():
+        OrderProduct.objects.bulk_create(lines, batch_size=BATCH)
+        connection.check_constraints(table_names=["crm_order_product"])
+
+    # Apply accumulated stock decrements with a single bulk_update
+    # instead of an UPDATE per line item
+    changed = [p for p in products if p.pk in stock_delta]
+    for product in changed:
+        product.stock -= stock_delta[product.pk]
+    Product.objects.bulk_update(changed, ["stock"], batch_size=BATCH)
+
+    # All order totals in one CASE/WHEN UPDATE
+    Order.objects.bulk_update(orders, ["total_amount"], batch_size=BATCH)
+
     print(f"Created {len(orders)} orders")
     return orders
 
 
-def seed():
-    """Run the full database seeding process."""
-    clear_database()
-    customers = create_customers()
-    products = create_products()
-    create_orders(customers, products)
+def seed(reset=False):
+    """Run the full database seeding process.
+
+    Everything happens inside one transaction: a single commit fsync
+    for the whole seed, and a failed run leaves the database untouched.
+
+    By default the seed is idempotent — customers upsert on email,
+    existing products are reused, and orders are only created on a
+    fresh database. Pass ``reset=True`` (or ``--reset`` on the CLI)
+    to wipe and rebuild everything, the old behavior.
+    """
+    _bootstrap()
+    with transaction.atomic():
+        if reset:
+            clear_database()
+        customers = create_customers()
+        products = create_products()
+        if reset or not Order.objects.exists():
+            create_orders(customers, products)
+        else:
+            print("Orders already present; skipping (use --reset to rebuild)")
     print("Seeding completed successfully!")
 
 
 if __name__ == "__main__":
-    seed()
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="wipe existing CRM data before seeding",
+    )
+    seed(reset=parser.parse_args().reset)